@@ -1,5 +1,8 @@
 from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask_caching import Cache
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, select
+from sqlalchemy.orm import deferred, selectinload, undefer
 from datetime import datetime, timedelta
 import random
 import os
@@ -7,22 +10,40 @@ import os
 app = Flask(__name__)
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///crm.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'pool_pre_ping': True, 'pool_recycle': 280}
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'crm-secret-key-2024')
 
 db = SQLAlchemy(app)
+cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache'})
+
+with app.app_context():
+    @event.listens_for(db.engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL lets readers proceed while a write is in flight, which matters
+        # because SQLite otherwise serializes every request on the file lock.
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute('PRAGMA cache_size=-20000')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.close()
+
+# In debug, any lazy load that a route did not plan for raises instead of
+# silently firing an extra query, so N+1 patterns surface during development.
+RELATIONSHIP_LAZY = 'raise' if app.debug else 'select'
 
 
 # Database Models
 class Account(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(200), nullable=False)
+    name = db.Column(db.String(200), nullable=False, index=True)
     industry = db.Column(db.String(100))
     phone = db.Column(db.String(50))
     website = db.Column(db.String(200))
     address = db.Column(db.String(300))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    contacts = db.relationship('Contact', backref='account', lazy=True)
-    tickets = db.relationship('Ticket', backref='account', lazy=True)
+    contacts = db.relationship('Contact', back_populates='account', lazy=RELATIONSHIP_LAZY)
+    tickets = db.relationship('Ticket', back_populates='account', lazy=RELATIONSHIP_LAZY)
 
 
 class Contact(db.Model):
@@ -32,72 +53,195 @@ class Contact(db.Model):
     email = db.Column(db.String(200))
     phone = db.Column(db.String(50))
     job_title = db.Column(db.String(100))
-    account_id = db.Column(db.Integer, db.ForeignKey('account.id'))
+    account_id = db.Column(db.Integer, db.ForeignKey('account.id'), index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    tickets = db.relationship('Ticket', backref='contact', lazy=True)
+    account = db.relationship('Account', back_populates='contacts', lazy=RELATIONSHIP_LAZY)
+    tickets = db.relationship('Ticket', back_populates='contact', lazy=RELATIONSHIP_LAZY)
 
 
 class Ticket(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     number = db.Column(db.String(20), unique=True, nullable=False)
     short_description = db.Column(db.String(200), nullable=False)
-    description = db.Column(db.Text)
+    # Deferred: list views only show short_description, so don't drag the
+    # full text along for every row
+    description = deferred(db.Column(db.Text))
     state = db.Column(db.String(50), default='New')
-    priority = db.Column(db.String(20), default='Medium')
+    priority = db.Column(db.String(20), default='Medium', index=True)
     category = db.Column(db.String(100))
     assigned_to = db.Column(db.String(100))
     account_id = db.Column(db.Integer, db.ForeignKey('account.id'))
     contact_id = db.Column(db.Integer, db.ForeignKey('contact.id'))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    account = db.relationship('Account', back_populates='tickets', lazy=RELATIONSHIP_LAZY)
+    contact = db.relationship('Contact', back_populates='tickets', lazy=RELATIONSHIP_LAZY)
+
+    # Covers the list view's state filter + created_at sort in one range scan
+    __table_args__ = (db.Index('ix_ticket_state_created', 'state', 'created_at'),)
 
 
 class Task(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
-    description = db.Column(db.Text)
-    due_date = db.Column(db.DateTime)
-    state = db.Column(db.String(50), default='Open')
+    description = deferred(db.Column(db.Text))
+    due_date = db.Column(db.DateTime, index=True)
+    state = db.Column(db.String(50), default='Open', index=True)
     priority = db.Column(db.String(20), default='Medium')
     assigned_to = db.Column(db.String(100))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 
+# Single-row counter backing ticket number generation
+class TicketSequence(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+
+# Full-text search: FTS5 tables shadowing the searchable columns, kept in
+# sync by triggers so list-view searches are index lookups instead of
+# LIKE '%...%' table scans.
+FTS_TABLES = {
+    'ticket': ('ticket_fts', ('number', 'short_description')),
+    'account': ('account_fts', ('name',)),
+    'contact': ('contact_fts', ('first_name', 'last_name', 'email')),
+}
+
+
+def init_fts():
+    for source, (fts, columns) in FTS_TABLES.items():
+        cols = ', '.join(columns)
+        new_values = ', '.join(f'new.{c}' for c in columns)
+        old_values = ', '.join(f'old.{c}' for c in columns)
+
+        existed = db.session.execute(db.text(
+            "SELECT 1 FROM sqlite_master WHERE name = :name"
+        ), {'name': fts}).first() is not None
+
+        db.session.execute(db.text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} "
+            f"USING fts5({cols}, content='{source}', content_rowid='id')"
+        ))
+        db.session.execute(db.text(
+            f"CREATE TRIGGER IF NOT EXISTS {source}_fts_insert AFTER INSERT ON {source} BEGIN "
+            f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END"
+        ))
+        db.session.execute(db.text(
+            f"CREATE TRIGGER IF NOT EXISTS {source}_fts_delete AFTER DELETE ON {source} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); END"
+        ))
+        db.session.execute(db.text(
+            f"CREATE TRIGGER IF NOT EXISTS {source}_fts_update AFTER UPDATE ON {source} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values}); END"
+        ))
+
+        # Backfill rows that were inserted before the FTS table existed
+        if not existed:
+            db.session.execute(db.text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+    db.session.commit()
+
+
+def fts_search(fts_table, search):
+    """Return the rowids matching a prefix search against an FTS5 table."""
+    # Quote each term so user input can't break the FTS query syntax
+    terms = ' '.join(f'"{term}"*' for term in search.replace('"', '').split())
+    if not terms:
+        return []
+    return db.session.execute(
+        db.text(f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH :q"),
+        {'q': terms}
+    ).scalars().all()
+
+
+# List views and form dropdowns are bounded so per-request memory stays
+# flat as the tables grow; dropdowns reach the rest via typeahead search.
+PER_PAGE = 50
+DROPDOWN_LIMIT = 20
+
+
+def dropdown_accounts(selected_id=None):
+    accounts = Account.query.order_by(Account.name).limit(DROPDOWN_LIMIT).all()
+    if selected_id and all(a.id != selected_id for a in accounts):
+        selected = db.session.get(Account, selected_id)
+        if selected:
+            accounts.append(selected)
+    return accounts
+
+
+def dropdown_contacts(selected_id=None):
+    contacts = Contact.query.order_by(Contact.last_name, Contact.first_name).limit(DROPDOWN_LIMIT).all()
+    if selected_id and all(c.id != selected_id for c in contacts):
+        selected = db.session.get(Contact, selected_id)
+        if selected:
+            contacts.append(selected)
+    return contacts
+
+
 # Helper function to generate ticket numbers
 def generate_ticket_number():
-    count = Ticket.query.count() + 1
-    return f"INC{count:07d}"
+    # Bump the counter row and read it back inside the current transaction,
+    # so the number stays unique under concurrent inserts without scanning
+    # the ticket table.
+    db.session.execute(db.text("UPDATE ticket_sequence SET value = value + 1"))
+    value = db.session.execute(db.text("SELECT value FROM ticket_sequence")).scalar()
+    return f"INC{value:07d}"
+
+
+# Every dashboard aggregate in one round trip: totals and both group-by
+# breakdowns come back as (dimension, value, count) rows and are split
+# apart in Python.
+DASHBOARD_STATS_SQL = db.text("""
+    SELECT 'total' AS dimension, 'tickets' AS value, COUNT(id) AS count FROM ticket
+    UNION ALL
+    SELECT 'total', 'open_tickets', COALESCE(SUM(
+        CASE WHEN state IN ('New', 'In Progress', 'On Hold') THEN 1 ELSE 0 END), 0) FROM ticket
+    UNION ALL
+    SELECT 'total', 'accounts', COUNT(id) FROM account
+    UNION ALL
+    SELECT 'total', 'contacts', COUNT(id) FROM contact
+    UNION ALL
+    SELECT 'state', state, COUNT(id) FROM ticket GROUP BY state
+    UNION ALL
+    SELECT 'priority', priority, COUNT(id) FROM ticket GROUP BY priority
+""")
+
+# Fixed-shape dashboard statements, built once at import so per-request work
+# is execution only; the SQL string is cached by the engine's compiled cache.
+RECENT_TICKETS_STMT = (
+    select(Ticket)
+    .options(selectinload(Ticket.account), selectinload(Ticket.contact))
+    .order_by(Ticket.created_at.desc())
+    .limit(10)
+)
+RECENT_ACCOUNTS_STMT = select(Account).order_by(Account.created_at.desc()).limit(5)
 
 
 # Routes
 @app.route('/')
+@cache.cached(timeout=30)
 def dashboard():
-    total_tickets = Ticket.query.count()
-    open_tickets = Ticket.query.filter(Ticket.state.in_(['New', 'In Progress', 'On Hold'])).count()
-    total_accounts = Account.query.count()
-    total_contacts = Contact.query.count()
-
-    recent_tickets = Ticket.query.order_by(Ticket.created_at.desc()).limit(10).all()
-    recent_accounts = Account.query.order_by(Account.created_at.desc()).limit(5).all()
+    stats = db.session.execute(DASHBOARD_STATS_SQL).all()
+    totals = {value: count for dimension, value, count in stats
+              if dimension == 'total'}
+    ticket_by_state = {value: count for dimension, value, count in stats
+                       if dimension == 'state'}
+    ticket_by_priority = {value: count for dimension, value, count in stats
+                          if dimension == 'priority'}
 
-    # Stats for charts
-    ticket_by_state = db.session.query(
-        Ticket.state, db.func.count(Ticket.id)
-    ).group_by(Ticket.state).all()
-
-    ticket_by_priority = db.session.query(
-        Ticket.priority, db.func.count(Ticket.id)
-    ).group_by(Ticket.priority).all()
+    recent_tickets = db.session.execute(RECENT_TICKETS_STMT).scalars().all()
+    recent_accounts = db.session.execute(RECENT_ACCOUNTS_STMT).scalars().all()
 
     return render_template('dashboard.html',
-                         total_tickets=total_tickets,
-                         open_tickets=open_tickets,
-                         total_accounts=total_accounts,
-                         total_contacts=total_contacts,
+                         total_tickets=totals['tickets'],
+                         open_tickets=totals['open_tickets'],
+                         total_accounts=totals['accounts'],
+                         total_contacts=totals['contacts'],
                          recent_tickets=recent_tickets,
                          recent_accounts=recent_accounts,
-                         ticket_by_state=dict(ticket_by_state),
-                         ticket_by_priority=dict(ticket_by_priority))
+                         ticket_by_state=ticket_by_state,
+                         ticket_by_priority=ticket_by_priority)
 
 
 # Ticket Routes
@@ -114,15 +258,13 @@ def tickets():
     if priority_filter:
         query = query.filter(Ticket.priority == priority_filter)
     if search:
-        query = query.filter(
-            db.or_(
-                Ticket.number.contains(search),
-                Ticket.short_description.contains(search)
-            )
-        )
+        query = query.filter(Ticket.id.in_(fts_search('ticket_fts', search)))
 
-    tickets = query.order_by(Ticket.created_at.desc()).all()
-    return render_template('tickets.html', tickets=tickets)
+    pagination = query.options(
+        selectinload(Ticket.account), selectinload(Ticket.contact)
+    ).order_by(Ticket.created_at.desc()).paginate(
+        page=request.args.get('page', 1, type=int), per_page=PER_PAGE, error_out=False)
+    return render_template('tickets.html', tickets=pagination.items, pagination=pagination)
 
 
 @app.route('/tickets/new', methods=['GET', 'POST'])
@@ -141,22 +283,26 @@ def new_ticket():
         )
         db.session.add(ticket)
         db.session.commit()
+        cache.delete('view//')  # dashboard counts are stale now
         return redirect(url_for('view_ticket', id=ticket.id))
 
-    accounts = Account.query.all()
-    contacts = Contact.query.all()
+    accounts = dropdown_accounts()
+    contacts = dropdown_contacts()
     return render_template('ticket_form.html', ticket=None, accounts=accounts, contacts=contacts)
 
 
 @app.route('/tickets/<int:id>')
 def view_ticket(id):
-    ticket = Ticket.query.get_or_404(id)
+    ticket = Ticket.query.options(
+        selectinload(Ticket.account), selectinload(Ticket.contact),
+        undefer(Ticket.description)
+    ).get_or_404(id)
     return render_template('ticket_view.html', ticket=ticket)
 
 
 @app.route('/tickets/<int:id>/edit', methods=['GET', 'POST'])
 def edit_ticket(id):
-    ticket = Ticket.query.get_or_404(id)
+    ticket = Ticket.query.options(undefer(Ticket.description)).get_or_404(id)
     if request.method == 'POST':
         ticket.short_description = request.form['short_description']
         ticket.description = request.form.get('description', '')
@@ -169,8 +315,8 @@ def edit_ticket(id):
         db.session.commit()
         return redirect(url_for('view_ticket', id=ticket.id))
 
-    accounts = Account.query.all()
-    contacts = Contact.query.all()
+    accounts = dropdown_accounts(ticket.account_id)
+    contacts = dropdown_contacts(ticket.contact_id)
     return render_template('ticket_form.html', ticket=ticket, accounts=accounts, contacts=contacts)
 
 
@@ -181,10 +327,13 @@ def accounts():
     query = Account.query
 
     if search:
-        query = query.filter(Account.name.contains(search))
+        query = query.filter(Account.id.in_(fts_search('account_fts', search)))
 
-    accounts = query.order_by(Account.created_at.desc()).all()
-    return render_template('accounts.html', accounts=accounts)
+    pagination = query.options(
+        selectinload(Account.contacts), selectinload(Account.tickets)
+    ).order_by(Account.created_at.desc()).paginate(
+        page=request.args.get('page', 1, type=int), per_page=PER_PAGE, error_out=False)
+    return render_template('accounts.html', accounts=pagination.items, pagination=pagination)
 
 
 @app.route('/accounts/new', methods=['GET', 'POST'])
@@ -199,6 +348,7 @@ def new_account():
         )
         db.session.add(account)
         db.session.commit()
+        cache.delete('view//')  # dashboard counts are stale now
         return redirect(url_for('view_account', id=account.id))
 
     return render_template('account_form.html', account=None)
@@ -206,7 +356,9 @@ def new_account():
 
 @app.route('/accounts/<int:id>')
 def view_account(id):
-    account = Account.query.get_or_404(id)
+    account = Account.query.options(
+        selectinload(Account.contacts), selectinload(Account.tickets)
+    ).get_or_404(id)
     return render_template('account_view.html', account=account)
 
 
@@ -232,16 +384,13 @@ def contacts():
     query = Contact.query
 
     if search:
-        query = query.filter(
-            db.or_(
-                Contact.first_name.contains(search),
-                Contact.last_name.contains(search),
-                Contact.email.contains(search)
-            )
-        )
+        query = query.filter(Contact.id.in_(fts_search('contact_fts', search)))
 
-    contacts = query.order_by(Contact.created_at.desc()).all()
-    return render_template('contacts.html', contacts=contacts)
+    pagination = query.options(
+        selectinload(Contact.account)
+    ).order_by(Contact.created_at.desc()).paginate(
+        page=request.args.get('page', 1, type=int), per_page=PER_PAGE, error_out=False)
+    return render_template('contacts.html', contacts=pagination.items, pagination=pagination)
 
 
 @app.route('/contacts/new', methods=['GET', 'POST'])
@@ -257,15 +406,18 @@ def new_contact():
         )
         db.session.add(contact)
         db.session.commit()
+        cache.delete('view//')  # dashboard counts are stale now
         return redirect(url_for('view_contact', id=contact.id))
 
-    accounts = Account.query.all()
+    accounts = dropdown_accounts()
     return render_template('contact_form.html', contact=None, accounts=accounts)
 
 
 @app.route('/contacts/<int:id>')
 def view_contact(id):
-    contact = Contact.query.get_or_404(id)
+    contact = Contact.query.options(
+        selectinload(Contact.account), selectinload(Contact.tickets)
+    ).get_or_404(id)
     return render_template('contact_view.html', contact=contact)
 
 
@@ -282,7 +434,7 @@ def edit_contact(id):
         db.session.commit()
         return redirect(url_for('view_contact', id=contact.id))
 
-    accounts = Account.query.all()
+    accounts = dropdown_accounts(contact.account_id)
     return render_template('contact_form.html', contact=contact, accounts=accounts)
 
 
@@ -295,8 +447,9 @@ def tasks():
     if state_filter:
         query = query.filter(Task.state == state_filter)
 
-    tasks = query.order_by(Task.due_date.asc()).all()
-    return render_template('tasks.html', tasks=tasks)
+    pagination = query.order_by(Task.due_date.asc()).paginate(
+        page=request.args.get('page', 1, type=int), per_page=PER_PAGE, error_out=False)
+    return render_template('tasks.html', tasks=pagination.items, pagination=pagination)
 
 
 @app.route('/tasks/new', methods=['GET', 'POST'])
@@ -323,7 +476,7 @@ def new_task():
 
 @app.route('/tasks/<int:id>/edit', methods=['GET', 'POST'])
 def edit_task(id):
-    task = Task.query.get_or_404(id)
+    task = Task.query.options(undefer(Task.description)).get_or_404(id)
     if request.method == 'POST':
         due_date = None
         if request.form.get('due_date'):
@@ -342,18 +495,34 @@ def edit_task(id):
 
 
 # API endpoints for AJAX
+@app.route('/api/accounts/search')
+def api_accounts_search():
+    q = request.args.get('q', '').strip()
+    stmt = select(Account.id, Account.name)
+    if q:
+        stmt = stmt.where(Account.id.in_(fts_search('account_fts', q)))
+    rows = db.session.execute(stmt.order_by(Account.name).limit(DROPDOWN_LIMIT)).all()
+    return jsonify([{'id': row.id, 'name': row.name} for row in rows])
+
+
 @app.route('/api/contacts/<int:account_id>')
 def api_contacts_by_account(account_id):
-    contacts = Contact.query.filter_by(account_id=account_id).all()
+    # Column-only select: skips ORM object construction for rows that only
+    # feed a two-field JSON payload
+    rows = db.session.execute(
+        select(Contact.id, Contact.first_name, Contact.last_name)
+        .where(Contact.account_id == account_id)
+    ).all()
     return jsonify([{
-        'id': c.id,
-        'name': f"{c.first_name} {c.last_name}"
-    } for c in contacts])
+        'id': row.id,
+        'name': f"{row.first_name} {row.last_name}"
+    } for row in rows])
 
 
 # Initialize database with sample data
 def init_db():
     db.create_all()
+    init_fts()
 
     if Account.query.count() == 0:
         # Sample accounts
@@ -365,11 +534,11 @@ def init_db():
             {'name': 'EduLearn Systems', 'industry': 'Education', 'phone': '555-0500', 'website': 'www.edulearn.edu'},
         ]
 
-        for acc_data in accounts_data:
-            account = Account(**acc_data)
-            db.session.add(account)
-
-        db.session.commit()
+        # bulk_insert_mappings skips Python-side column defaults, so
+        # created_at has to be supplied explicitly
+        now = datetime.utcnow()
+        db.session.bulk_insert_mappings(
+            Account, [dict(acc_data, created_at=now) for acc_data in accounts_data])
 
         # Sample contacts
         contacts_data = [
@@ -382,11 +551,8 @@ def init_db():
             {'first_name': 'James', 'last_name': 'Wilson', 'email': 'james.w@techstart.io', 'job_title': 'Developer', 'account_id': 2},
         ]
 
-        for contact_data in contacts_data:
-            contact = Contact(**contact_data)
-            db.session.add(contact)
-
-        db.session.commit()
+        db.session.bulk_insert_mappings(
+            Contact, [dict(contact_data, created_at=now) for contact_data in contacts_data])
 
         # Sample tickets
         states = ['New', 'In Progress', 'On Hold', 'Resolved', 'Closed']
@@ -408,22 +574,23 @@ def init_db():
             'Backup restoration needed',
         ]
 
-        for i, subject in enumerate(ticket_subjects):
-            ticket = Ticket(
-                number=f"INC{i+1:07d}",
-                short_description=subject,
-                description=f"Detailed description for: {subject}",
-                state=random.choice(states),
-                priority=random.choice(priorities),
-                category=random.choice(categories),
-                assigned_to=random.choice(['Admin', 'Support Team', 'IT Dept', '']),
-                account_id=random.randint(1, 5),
-                contact_id=random.randint(1, 7),
-                created_at=datetime.utcnow() - timedelta(days=random.randint(0, 30))
-            )
-            db.session.add(ticket)
-
-        db.session.commit()
+        ticket_rows = [
+            {
+                'number': f"INC{i+1:07d}",
+                'short_description': subject,
+                'description': f"Detailed description for: {subject}",
+                'state': random.choice(states),
+                'priority': random.choice(priorities),
+                'category': random.choice(categories),
+                'assigned_to': random.choice(['Admin', 'Support Team', 'IT Dept', '']),
+                'account_id': random.randint(1, 5),
+                'contact_id': random.randint(1, 7),
+                'created_at': datetime.utcnow() - timedelta(days=random.randint(0, 30)),
+                'updated_at': datetime.utcnow(),
+            }
+            for i, subject in enumerate(ticket_subjects)
+        ]
+        db.session.bulk_insert_mappings(Ticket, ticket_rows)
 
         # Sample tasks
         task_titles = [
@@ -434,23 +601,42 @@ def init_db():
             'Team meeting preparation',
         ]
 
-        for title in task_titles:
-            task = Task(
-                title=title,
-                description=f"Description for {title}",
-                due_date=datetime.utcnow() + timedelta(days=random.randint(1, 14)),
-                state=random.choice(['Open', 'In Progress', 'Completed']),
-                priority=random.choice(priorities),
-                assigned_to=random.choice(['Admin', 'Support Team', ''])
-            )
-            db.session.add(task)
+        task_rows = [
+            {
+                'title': title,
+                'description': f"Description for {title}",
+                'due_date': datetime.utcnow() + timedelta(days=random.randint(1, 14)),
+                'state': random.choice(['Open', 'In Progress', 'Completed']),
+                'priority': random.choice(priorities),
+                'assigned_to': random.choice(['Admin', 'Support Team', '']),
+                'created_at': now,
+            }
+            for title in task_titles
+        ]
+        db.session.bulk_insert_mappings(Task, task_rows)
 
         db.session.commit()
 
+    # Seed the ticket number counter; on an existing database, start it
+    # from however many tickets are already there.
+    if TicketSequence.query.count() == 0:
+        db.session.add(TicketSequence(value=Ticket.query.count()))
+        db.session.commit()
 
-# Initialize database on import (for PythonAnywhere)
-with app.app_context():
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create tables and FTS indexes, and seed sample data."""
     init_db()
+    print('Initialized the database.')
+
+
+# Only initialize on import when the database file does not exist yet (fresh
+# PythonAnywhere deploy); otherwise every gunicorn worker would re-run the
+# startup queries. Use `flask init-db` to initialize explicitly.
+if not os.path.exists(os.path.join(app.instance_path, 'crm.db')):
+    with app.app_context():
+        init_db()
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
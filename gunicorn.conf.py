@@ -0,0 +1,11 @@
+# Gunicorn settings for ConstructCRM.
+#
+# The views are I/O-bound on SQLite, so threaded (gthread) workers let one
+# process keep serving other requests while a request waits on the database.
+# WAL journal mode (configured in app.py) allows those threads to read
+# concurrently instead of queuing on the file lock.
+bind = '0.0.0.0:8000'
+workers = 2
+worker_class = 'gthread'
+threads = 8
+timeout = 30
@@ -42,6 +42,34 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
 
+    // Account dropdown typeahead (the server only sends a bounded list)
+    const accountSearch = document.getElementById('accountSearch');
+    if (accountSearch && accountSelect) {
+        let searchTimer = null;
+        accountSearch.addEventListener('input', function() {
+            const query = this.value.trim();
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => {
+                fetch('/api/accounts/search?q=' + encodeURIComponent(query))
+                    .then(response => response.json())
+                    .then(accounts => {
+                        const selected = accountSelect.value;
+                        accountSelect.innerHTML = '<option value="">-- Select Account --</option>';
+                        accounts.forEach(account => {
+                            const option = document.createElement('option');
+                            option.value = account.id;
+                            option.textContent = account.name;
+                            if (String(account.id) === selected) {
+                                option.selected = true;
+                            }
+                            accountSelect.appendChild(option);
+                        });
+                    })
+                    .catch(error => console.error('Error searching accounts:', error));
+            }, 200);
+        });
+    }
+
     // Add hover effects to table rows
     const tableRows = document.querySelectorAll('.data-table tbody tr');
     tableRows.forEach(row => {
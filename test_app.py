@@ -0,0 +1,78 @@
+"""Query-count regression tests.
+
+Each list endpoint should issue a small, fixed number of queries no
+matter how many rows exist; if someone reintroduces a lazy-load N+1,
+these counts blow past the thresholds and the test fails like any other
+bug.
+"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app import app, cache, db, init_db
+
+
+@pytest.fixture(scope='module')
+def client():
+    with app.app_context():
+        init_db()
+    with app.test_client() as test_client:
+        yield test_client
+
+
+@contextmanager
+def count_queries():
+    """Collect every statement sent to the database during the block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def test_dashboard_query_count(client):
+    cache.clear()  # the dashboard is cached; measure a cold hit
+    with count_queries() as statements:
+        response = client.get('/')
+    assert response.status_code == 200
+    # stats UNION + recent tickets + 2 selectin batches + recent accounts
+    assert len(statements) <= 6, statements
+
+
+def test_dashboard_served_from_cache(client):
+    cache.clear()
+    client.get('/')
+    with count_queries() as statements:
+        response = client.get('/')
+    assert response.status_code == 200
+    assert len(statements) == 0, statements
+
+
+def test_tickets_list_query_count(client):
+    with count_queries() as statements:
+        response = client.get('/tickets')
+    assert response.status_code == 200
+    # page select + pagination count + 2 selectin batches
+    assert len(statements) <= 5, statements
+
+
+def test_accounts_list_query_count(client):
+    with count_queries() as statements:
+        response = client.get('/accounts')
+    assert response.status_code == 200
+    assert len(statements) <= 5, statements
+
+
+def test_contacts_list_query_count(client):
+    with count_queries() as statements:
+        response = client.get('/contacts')
+    assert response.status_code == 200
+    assert len(statements) <= 4, statements